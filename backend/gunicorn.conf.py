@@ -0,0 +1,53 @@
+"""
+Gunicorn configuration for ContractRiskAI
+Runs the FastAPI app under multiple uvicorn workers for production
+"""
+
+import math
+import multiprocessing
+import os
+
+# Bind to the platform-provided port (Railway sets PORT)
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+def available_cpus() -> int:
+    """
+    CPUs this process may actually use: the affinity mask, capped by a
+    cgroup v2 CPU quota when running in a container.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = multiprocessing.cpu_count()
+    
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    
+    return cpus
+
+# One event loop per worker; 2n+1 workers keeps every core busy
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY") or available_cpus() * 2 + 1)
+
+# Workers read this to split OPENAI_MAX_CONCURRENCY between them
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Periodically recycle workers to reclaim memory held by the in-process caches
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+# Worker heartbeat timeout: restarts a worker whose event loop stops
+# responding. It does not bound how long an async request may run; slow or
+# hung OpenAI calls are cut off by OPENAI_TIMEOUT instead.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
@@ -5,27 +5,57 @@ A showcase of prompt engineering for contract risk analysis
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple, Type, TypeVar
 import os
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import asyncio
+from functools import cache
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain.output_parsers import PydanticOutputParser
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain.prompts import ChatPromptTemplate
 from langchain.callbacks import LangChainTracer
 from langfuse import Langfuse
-import json
-from datetime import datetime
+import orjson
+import hashlib
+import httpx
+import time
+from datetime import datetime, timezone
+from cachetools import TTLCache
+from semantic_cache import SemanticCache
 from prompts import (
     SYSTEM_PROMPT, 
     get_enhanced_prompt, 
+    get_batch_prompt,
+    normalize_context,
+    normalize_industry,
     RiskAnalysisOutput,
-    RiskAnalysisOutputArabic
+    RiskAnalysisOutputArabic,
+    RiskAnalysisBatchItem,
+    RiskAnalysisBatchOutput
 )
 
 # Load environment variables
 load_dotenv()
 
+# Non-blocking logging: records are queued on the event loop and written
+# by a background listener thread
+log_queue: queue.Queue = queue.Queue(-1)
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+log_listener = QueueListener(log_queue, log_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logger = logging.getLogger("contractriskai")
+logger.setLevel(os.getenv("LOG_LEVEL", "info").upper())
+logger.addHandler(QueueHandler(log_queue))
+logger.propagate = False
+
 # Initialize FastAPI
 app = FastAPI(
     title="ContractRiskAI",
@@ -53,8 +83,97 @@ class ClauseAnalysisResponse(BaseModel):
     arabic: Dict[str, Any]
     metadata: Dict[str, Any]
 
+# In-process cache of completed analyses, keyed on the normalized request
+ANALYSIS_CACHE: TTLCache = TTLCache(
+    maxsize=int(os.getenv("ANALYSIS_CACHE_SIZE", "10000")),
+    ttl=int(os.getenv("ANALYSIS_CACHE_TTL", "3600"))
+)
+
+# Authoritative model, plus a cheaper screener that answers first and hands off
+# to CHAT_MODEL for anything it doesn't rate Low
+CHAT_MODEL = "gpt-4o"
+SCREENER_ENABLED = os.getenv("SCREENER_ENABLED", "true").lower() == "true"
+SCREENER_MODEL = os.getenv("SCREENER_MODEL", "gpt-4o-mini")
+
+# Upper bound on in-flight OpenAI calls (chat and embeddings), to stay within
+# the key's rate limits. OPENAI_MAX_CONCURRENCY is the budget for the whole
+# server; each gunicorn worker (WEB_CONCURRENCY, exported by gunicorn.conf.py)
+# gets an equal share, but never less than one slot.
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "32"))
+WEB_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY") or 1))
+if WEB_WORKERS > OPENAI_MAX_CONCURRENCY:
+    logger.warning(
+        "WEB_CONCURRENCY=%d exceeds OPENAI_MAX_CONCURRENCY=%d; each worker still gets "
+        "one slot, so up to %d OpenAI calls may be in flight",
+        WEB_WORKERS, OPENAI_MAX_CONCURRENCY, WEB_WORKERS
+    )
+OPENAI_SEMAPHORE = asyncio.Semaphore(max(1, OPENAI_MAX_CONCURRENCY // WEB_WORKERS))
+
+# Maximum number of clauses packed into a single batched model call
+BATCH_GROUP_SIZE = int(os.getenv("BATCH_GROUP_SIZE", "5"))
+
+# Maximum number of clauses accepted by /api/batch-analyze
+MAX_BATCH_CLAUSES = int(os.getenv("MAX_BATCH_CLAUSES", "50"))
+
+# Embedding-based cache for near-duplicate clauses (e.g. differing party names)
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+SEMANTIC_CACHE = SemanticCache(
+    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+    max_entries=int(os.getenv("SEMANTIC_CACHE_SIZE", "2000")),
+    ttl=int(os.getenv("ANALYSIS_CACHE_TTL", "3600"))
+)
+
+def get_cache_key(request: ClauseAnalysisRequest) -> bytes:
+    """
+    Build a compact cache key from the clause, context and industry.
+    """
+    clause = request.clause.strip()
+    context = normalize_context(request.context)
+    industry = normalize_industry(request.industry)
+    return hashlib.blake2b(
+        f"{clause}|{context}|{industry}".encode(),
+        digest_size=16
+    ).digest()
+
+def get_scope_key(request: ClauseAnalysisRequest) -> bytes:
+    """
+    Build the semantic cache scope from the context and industry only.
+    """
+    context = normalize_context(request.context)
+    industry = normalize_industry(request.industry)
+    return hashlib.blake2b(
+        f"{context}|{industry}".encode(),
+        digest_size=16
+    ).digest()
+
+# Per-call timeout for every OpenAI request, in seconds. Passed to the
+# LangChain models too, since they would otherwise override the client default.
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+
+# Shared async HTTP client for all OpenAI calls. HTTP/2 multiplexes concurrent
+# requests over warm connections instead of opening one per call.
+@cache
+def get_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "256")),
+            max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "128"))
+        ),
+        timeout=OPENAI_TIMEOUT,
+        http2=True
+    )
+
+@cache
+def get_embeddings():
+    return OpenAIEmbeddings(
+        model="text-embedding-3-small",
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        request_timeout=OPENAI_TIMEOUT,
+        http_async_client=get_http_client()
+    )
+
 # Initialize LLM with optional tracing
-def get_llm():
+def create_chat_llm(model: str) -> ChatOpenAI:
     callbacks = []
     
     # Add LangFuse tracing if enabled
@@ -68,15 +187,27 @@ def get_llm():
         # For now, we'll skip the callback as the API has changed
     
     return ChatOpenAI(
-        model="gpt-4o",
+        model=model,
         temperature=0.1,
         openai_api_key=os.getenv("OPENAI_API_KEY"),
         callbacks=callbacks,
+        request_timeout=OPENAI_TIMEOUT,
+        http_async_client=get_http_client(),
         model_kwargs={
             "response_format": {"type": "json_object"}
         }
     )
 
+# Models are built once on first use and shared across requests so the
+# underlying HTTP connection pool stays warm.
+@cache
+def get_llm():
+    return create_chat_llm(CHAT_MODEL)
+
+@cache
+def get_screener_llm():
+    return create_chat_llm(SCREENER_MODEL)
+
 # Health check endpoint
 @app.get("/")
 async def root():
@@ -87,6 +218,236 @@ async def root():
         "documentation": "/docs"
     }
 
+def validate_clause(request: ClauseAnalysisRequest) -> None:
+    """
+    Reject clauses that are too short to analyze meaningfully.
+    """
+    if not request.clause or len(request.clause.strip()) < 10:
+        raise HTTPException(
+            status_code=400,
+            detail="Please provide a valid contract clause (at least 10 characters)"
+        )
+
+def serve_cached(
+    cached: ClauseAnalysisResponse,
+    request: ClauseAnalysisRequest,
+    **cache_metadata: Any
+) -> ClauseAnalysisResponse:
+    """
+    Return a cached analysis with its per-request metadata refreshed.
+    """
+    return cached.model_copy(update={
+        "metadata": {
+            **cached.metadata,
+            "cache_hit": True,
+            **cache_metadata,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "clause_length": len(request.clause),
+            "has_context": bool(normalize_context(request.context)),
+            "industry": request.industry
+        }
+    })
+
+def lookup_exact(request: ClauseAnalysisRequest) -> Optional[ClauseAnalysisResponse]:
+    """
+    Serve repeated clauses straight from the exact-match cache.
+    """
+    cached = ANALYSIS_CACHE.get(get_cache_key(request))
+    if cached is None:
+        return None
+    return serve_cached(cached, request, cache_type="exact")
+
+def lookup_semantic(
+    request: ClauseAnalysisRequest,
+    embedding: Optional[List[float]]
+) -> Optional[ClauseAnalysisResponse]:
+    """
+    Serve near-duplicate clauses from the semantic cache.
+    """
+    match = SEMANTIC_CACHE.lookup(get_scope_key(request), embedding) if embedding else None
+    if match is None:
+        return None
+    similar, similarity = match
+    return serve_cached(
+        similar,
+        request,
+        cache_type="semantic",
+        cache_similarity=round(similarity, 4)
+    )
+
+async def embed_clauses(requests: List[ClauseAnalysisRequest]) -> List[Optional[List[float]]]:
+    """
+    Embed several clauses in a single call for the semantic cache.
+    Returns None per clause if the cache is disabled or the call fails.
+    """
+    if not SEMANTIC_CACHE_ENABLED or not requests:
+        return [None] * len(requests)
+    try:
+        async with OPENAI_SEMAPHORE:
+            return await get_embeddings().aembed_documents(
+                [request.clause.strip() for request in requests]
+            )
+    except Exception as e:
+        # The cache is an optimization only - carry on without it
+        logger.warning("Semantic cache embedding failed: %s", e)
+        return [None] * len(requests)
+
+async def lookup_cache(
+    request: ClauseAnalysisRequest,
+    embedding: Optional[List[float]] = None
+) -> Tuple[Optional[ClauseAnalysisResponse], Optional[List[float]]]:
+    """
+    Look the clause up in the exact-match cache, then the semantic cache.
+    The clause is embedded unless a precomputed embedding is passed in.
+    Returns the cached analysis (if any) and the clause embedding, which
+    callers pass back to store_analysis on a miss.
+    """
+    cached = lookup_exact(request)
+    if cached is not None:
+        return cached, embedding
+    
+    if embedding is None:
+        embedding = (await embed_clauses([request]))[0]
+    
+    return lookup_semantic(request, embedding), embedding
+
+def build_analysis(
+    request: ClauseAnalysisRequest,
+    result: RiskAnalysisOutput,
+    processing_ms: float,
+    model: str = CHAT_MODEL,
+    **extra_metadata: Any
+) -> ClauseAnalysisResponse:
+    """
+    Turn a validated model output into the bilingual API response.
+    """
+    # Prepare metadata
+    metadata = {
+        "processing_time": f"{processing_ms / 1000:.2f}s",
+        "model": model,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "clause_length": len(request.clause),
+        "has_context": bool(normalize_context(request.context)),
+        "industry": request.industry,
+        "cache_hit": False,
+        **extra_metadata
+    }
+    
+    return ClauseAnalysisResponse(
+        # Batched outputs also echo their clause number, which is not part of the response
+        english=result.model_dump(exclude={"arabic", "clause"}),
+        arabic=result.arabic.model_dump(),
+        metadata=metadata
+    )
+
+def store_analysis(
+    request: ClauseAnalysisRequest,
+    analysis: ClauseAnalysisResponse,
+    embedding: Optional[List[float]]
+) -> None:
+    """
+    Record a fresh analysis in the exact-match and semantic caches.
+    """
+    ANALYSIS_CACHE[get_cache_key(request)] = analysis
+    if embedding:
+        SEMANTIC_CACHE.add(get_scope_key(request), embedding, analysis)
+
+def should_screen(request: ClauseAnalysisRequest) -> bool:
+    """
+    Industry-specific analysis always goes straight to CHAT_MODEL.
+    """
+    return SCREENER_ENABLED and not normalize_industry(request.industry)
+
+OutputSchema = TypeVar("OutputSchema", bound=BaseModel)
+
+async def invoke_model(
+    llm: ChatOpenAI,
+    messages: List[Tuple[str, str]],
+    schema: Type[OutputSchema]
+) -> Tuple[OutputSchema, float]:
+    """
+    Run one chat completion under the OpenAI concurrency cap and validate it.
+    Returns the parsed output and the elapsed time in milliseconds.
+    """
+    async with OPENAI_SEMAPHORE:
+        # Time the model call only, not the wait for a concurrency slot
+        start_ns = time.perf_counter_ns()
+        response = await llm.ainvoke(messages)
+        processing_ms = (time.perf_counter_ns() - start_ns) / 1e6
+    
+    # Parse and validate the JSON response (both English and Arabic) in one pass
+    return schema.model_validate_json(response.content), processing_ms
+
+async def invoke_batch(
+    llm: ChatOpenAI,
+    requests: List[ClauseAnalysisRequest]
+) -> Tuple[List[RiskAnalysisBatchItem], float]:
+    """
+    Analyze clauses sharing the same context and industry in one batched call.
+    Outputs are returned in the same order as the requests.
+    """
+    prompt = get_batch_prompt(
+        clauses=[request.clause for request in requests],
+        context=requests[0].context,
+        industry=requests[0].industry
+    )
+    messages = [
+        ("system", SYSTEM_PROMPT),
+        ("human", prompt)
+    ]
+    
+    output, processing_ms = await invoke_model(llm, messages, RiskAnalysisBatchOutput)
+    
+    # Match outputs to clauses by the echoed clause number, never by position
+    by_number = {item.clause: item for item in output.results}
+    if len(output.results) != len(requests) or set(by_number) != set(range(1, len(requests) + 1)):
+        raise ValueError("Batch response does not cover each clause exactly once")
+    return [by_number[number] for number in range(1, len(requests) + 1)], processing_ms
+
+async def analyze_uncached(
+    request: ClauseAnalysisRequest,
+    embedding: Optional[List[float]],
+    screen: bool
+) -> ClauseAnalysisResponse:
+    """
+    Analyze a clause that missed the cache and store the result.
+    With screen=False the clause goes straight to CHAT_MODEL, e.g. when
+    the screener has already rated it above Low.
+    """
+    # Create the prompt with enhanced context
+    prompt = get_enhanced_prompt(
+        clause=request.clause,
+        context=request.context,
+        industry=request.industry
+    )
+    
+    # Send the messages directly without ChatPromptTemplate to avoid variable conflicts
+    messages = [
+        ("system", SYSTEM_PROMPT),
+        ("human", prompt)
+    ]
+    
+    # Screen with the cheaper model first; escalate anything not rated Low
+    result, model, processing_ms = None, CHAT_MODEL, 0.0
+    if screen:
+        try:
+            result, processing_ms = await invoke_model(
+                get_screener_llm(), messages, RiskAnalysisOutput
+            )
+            model = SCREENER_MODEL
+        except Exception as e:
+            logger.warning("Screening failed, escalating to %s: %s", CHAT_MODEL, e)
+    
+    if result is None or result.risk != "Low":
+        result, escalated_ms = await invoke_model(get_llm(), messages, RiskAnalysisOutput)
+        model = CHAT_MODEL
+        processing_ms += escalated_ms
+    
+    analysis = build_analysis(request, result, processing_ms, model=model)
+    store_analysis(request, analysis, embedding)
+    
+    return analysis
+
 # Main analysis endpoint
 @app.post("/api/analyze", response_model=ClauseAnalysisResponse)
 async def analyze_clause(request: ClauseAnalysisRequest):
@@ -96,109 +457,188 @@ async def analyze_clause(request: ClauseAnalysisRequest):
     """
     try:
         # Validate input
-        if not request.clause or len(request.clause.strip()) < 10:
-            raise HTTPException(
-                status_code=400,
-                detail="Please provide a valid contract clause (at least 10 characters)"
-            )
-        
-        # Get the LLM instance
-        llm = get_llm()
-        
-        # Create the prompt with enhanced context
-        prompt = get_enhanced_prompt(
-            clause=request.clause,
-            context=request.context,
-            industry=request.industry
-        )
-        
-        # Create parser for structured output
-        parser = PydanticOutputParser(pydantic_object=RiskAnalysisOutput)
-        
-        # Format the prompt - use from_template to avoid variable substitution issues
-        messages = [
-            ("system", SYSTEM_PROMPT),
-            ("human", prompt)
-        ]
-        
-        # Get the response directly without ChatPromptTemplate to avoid variable conflicts
-        start_time = datetime.now()
-        response = llm.invoke(messages)
-        processing_time = (datetime.now() - start_time).total_seconds()
+        validate_clause(request)
         
-        # Parse the JSON response
-        result = json.loads(response.content)
+        cached, embedding = await lookup_cache(request)
+        if cached is not None:
+            return cached
         
-        # Ensure we have both English and Arabic responses
-        if "summary" not in result or "arabic" not in result:
-            raise HTTPException(
-                status_code=500,
-                detail="Invalid response format from AI model"
-            )
-        
-        # Extract English and Arabic parts
-        english_result = {
-            "summary": result.get("summary"),
-            "risk": result.get("risk"),
-            "reason": result.get("reason"),
-            "rewrite": result.get("rewrite")
-        }
-        
-        arabic_result = result.get("arabic", {})
-        
-        # Prepare metadata
-        metadata = {
-            "processing_time": f"{processing_time:.2f}s",
-            "model": "gpt-4o",
-            "timestamp": datetime.now().isoformat(),
-            "clause_length": len(request.clause),
-            "has_context": bool(request.context),
-            "industry": request.industry
-        }
-        
-        return ClauseAnalysisResponse(
-            english=english_result,
-            arabic=arabic_result,
-            metadata=metadata
-        )
+        return await analyze_uncached(request, embedding, screen=should_screen(request))
         
+    except HTTPException:
+        # Client errors (e.g. a too-short clause) pass through unchanged
+        raise
     except Exception as e:
-        # Log error appropriately in production
-        print(f"Error in analyze_clause: {str(e)}")
+        logger.exception("analyze_clause failed")
         raise HTTPException(
             status_code=500,
             detail=f"Analysis failed: {str(e)}"
         )
 
+async def analyze_clause_group(requests: List[ClauseAnalysisRequest]) -> List[Any]:
+    """
+    Analyze clauses that share the same context and industry with batched LLM calls.
+    Returns a ClauseAnalysisResponse or an Exception per clause, in order.
+    """
+    results: List[Any] = [None] * len(requests)
+    
+    valid = []
+    for index, request in enumerate(requests):
+        try:
+            validate_clause(request)
+            valid.append(index)
+        except HTTPException as e:
+            results[index] = e
+    
+    # Only clauses missing from the cache go to the model. Exact hits are
+    # checked first, then the rest are embedded together in one call.
+    exact_misses = []
+    for index in valid:
+        cached = lookup_exact(requests[index])
+        if cached is not None:
+            results[index] = cached
+        else:
+            exact_misses.append(index)
+    
+    embeddings = await embed_clauses([requests[index] for index in exact_misses])
+    pending = []
+    for index, embedding in zip(exact_misses, embeddings):
+        cached = lookup_semantic(requests[index], embedding)
+        if cached is not None:
+            results[index] = cached
+        else:
+            pending.append((index, embedding))
+    
+    if not pending:
+        return results
+    
+    pending_requests = [requests[index] for index, _ in pending]
+    outputs: List[Optional[RiskAnalysisBatchItem]] = [None] * len(pending)
+    models = [CHAT_MODEL] * len(pending)
+    timings = [0.0] * len(pending)
+    batch_sizes = [len(pending)] * len(pending)
+    
+    # Screen the whole group with the cheaper model; keep only its Low ratings
+    if should_screen(pending_requests[0]):
+        try:
+            screened, screened_ms = await invoke_batch(get_screener_llm(), pending_requests)
+            for position, output in enumerate(screened):
+                timings[position] = screened_ms
+                if output.risk == "Low":
+                    outputs[position] = output
+                    models[position] = SCREENER_MODEL
+        except Exception as e:
+            logger.warning("Batched screening failed, escalating to %s: %s", CHAT_MODEL, e)
+    
+    escalate = [position for position, output in enumerate(outputs) if output is None]
+    if escalate:
+        try:
+            escalated, escalated_ms = await invoke_batch(
+                get_llm(), [pending_requests[position] for position in escalate]
+            )
+            for position, output in zip(escalate, escalated):
+                outputs[position] = output
+                timings[position] += escalated_ms
+                batch_sizes[position] = len(escalate)
+        except Exception as e:
+            # Fall back to one call per clause rather than failing the whole group
+            logger.warning("Batched analysis failed, retrying individually: %s", e)
+            retried = await asyncio.gather(
+                *(
+                    analyze_uncached(pending_requests[position], pending[position][1], screen=False)
+                    for position in escalate
+                ),
+                return_exceptions=True
+            )
+            for position, result in zip(escalate, retried):
+                results[pending[position][0]] = result
+    
+    for position, (index, embedding) in enumerate(pending):
+        if outputs[position] is None:
+            continue
+        try:
+            analysis = build_analysis(
+                requests[index],
+                outputs[position],
+                timings[position],
+                model=models[position],
+                batch_size=batch_sizes[position]
+            )
+            store_analysis(requests[index], analysis, embedding)
+            results[index] = analysis
+        except Exception as e:
+            results[index] = e
+    
+    return results
+
+async def stream_batch_results(
+    clauses: List[ClauseAnalysisRequest],
+    chunks: List[List[int]]
+) -> AsyncIterator[bytes]:
+    """
+    Yield one NDJSON line per clause as soon as its group finishes.
+    Lines carry the clause index since they arrive out of order.
+    """
+    async def run_chunk(chunk: List[int]) -> Tuple[List[int], List[Any]]:
+        try:
+            return chunk, await analyze_clause_group([clauses[index] for index in chunk])
+        except Exception as e:
+            return chunk, [e] * len(chunk)
+    
+    # Fan out all groups concurrently - each call is network-bound
+    tasks = [asyncio.create_task(run_chunk(chunk)) for chunk in chunks]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            chunk, chunk_results = await next_done
+            for index, result in zip(chunk, chunk_results):
+                if isinstance(result, Exception):
+                    line = {
+                        "index": index,
+                        "status": "error",
+                        "error": str(result),
+                        "clause": clauses[index].clause[:50] + "..."
+                    }
+                else:
+                    line = {
+                        "index": index,
+                        "status": "success",
+                        "result": result.model_dump()
+                    }
+                yield orjson.dumps(line) + b"\n"
+    finally:
+        # Stop outstanding model calls if the client disconnects
+        for task in tasks:
+            task.cancel()
+
 # Batch analysis endpoint for multiple clauses
 @app.post("/api/batch-analyze")
-async def batch_analyze(clauses: list[ClauseAnalysisRequest]):
+async def batch_analyze(clauses: list[ClauseAnalysisRequest]) -> StreamingResponse:
     """
     Analyze multiple contract clauses in a single request.
     Useful for analyzing entire contracts.
+    Results are streamed as NDJSON, one line per clause, as they complete.
     """
-    if len(clauses) > 10:
+    if len(clauses) > MAX_BATCH_CLAUSES:
         raise HTTPException(
             status_code=400,
-            detail="Maximum 10 clauses per batch request"
+            detail=f"Maximum {MAX_BATCH_CLAUSES} clauses per batch request"
         )
     
-    results = []
-    for clause_request in clauses:
-        try:
-            result = await analyze_clause(clause_request)
-            results.append({
-                "status": "success",
-                "result": result
-            })
-        except Exception as e:
-            results.append({
-                "status": "error",
-                "error": str(e),
-                "clause": clause_request.clause[:50] + "..."
-            })
+    # Pack clauses sharing context and industry into groups of BATCH_GROUP_SIZE,
+    # so each group is analyzed in a single model call
+    groups: Dict[bytes, List[int]] = {}
+    for index, clause_request in enumerate(clauses):
+        groups.setdefault(get_scope_key(clause_request), []).append(index)
+    chunks = [
+        indices[start:start + BATCH_GROUP_SIZE]
+        for indices in groups.values()
+        for start in range(0, len(indices), BATCH_GROUP_SIZE)
+    ]
     
-    return {"results": results, "total": len(clauses)}
+    return StreamingResponse(
+        stream_batch_results(clauses, chunks),
+        media_type="application/x-ndjson"
+    )
 
 # Example clauses endpoint for demo purposes
 @app.get("/api/examples")
@@ -226,6 +666,7 @@ async def get_examples():
         ]
     }
 
+# Local development only - production runs under gunicorn (see gunicorn.conf.py)
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
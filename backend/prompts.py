@@ -4,23 +4,34 @@ Demonstrates advanced prompting techniques for contract analysis
 """
 
 from pydantic import BaseModel, Field
-from typing import Literal
+from typing import List, Literal, Optional
+from types import MappingProxyType
+from string import Template
 
 # Structured output models
-class RiskAnalysisOutput(BaseModel):
-    summary: str = Field(..., max_length=40, description="Plain English summary of the clause")
-    risk: Literal["Low", "Medium", "High"] = Field(..., description="Risk level assessment")
-    reason: str = Field(..., max_length=25, description="Brief reason for risk rating")
-    rewrite: str = Field(..., max_length=40, description="Safer alternative wording")
-
 class RiskAnalysisOutputArabic(BaseModel):
     summary: str = Field(..., description="Arabic translation of summary")
     risk: str = Field(..., description="Arabic risk level")
     reason: str = Field(..., description="Arabic reason")
     rewrite: str = Field(..., description="Arabic rewrite")
 
+# Word limits are enforced by the prompt; the model output is validated
+# for shape only, so character caps would reject well-formed answers
+class RiskAnalysisOutput(BaseModel):
+    summary: str = Field(..., description="Plain English summary of the clause (≤ 40 words)")
+    risk: Literal["Low", "Medium", "High"] = Field(..., description="Risk level assessment")
+    reason: str = Field(..., description="Brief reason for risk rating (≤ 25 words)")
+    rewrite: str = Field(..., description="Safer alternative wording (≤ 40 words)")
+    arabic: RiskAnalysisOutputArabic = Field(..., description="Arabic version of the analysis")
+
+class RiskAnalysisBatchItem(RiskAnalysisOutput):
+    clause: int = Field(..., description="Number of the clause this analysis belongs to")
+
+class RiskAnalysisBatchOutput(BaseModel):
+    results: List[RiskAnalysisBatchItem] = Field(..., description="One analysis per clause")
+
 # Core system prompt from Context.md
-SYSTEM_PROMPT = """You are "ContractRiskAI", a senior UAE contract lawyer who writes in plain language.
+BASE_SYSTEM_PROMPT = """You are "ContractRiskAI", a senior UAE contract lawyer who writes in plain language.
 
 PURPOSE
 For every contract CLAUSE you receive, produce one concise JSON object that helps a busy business user spot legal/commercial risk fast.
@@ -69,28 +80,8 @@ High Risk:
 DISCLAIMER
 You are an AI assistant, not a lawyer; users must obtain licensed legal advice."""
 
-def get_enhanced_prompt(clause: str, context: str = None, industry: str = None) -> str:
-    """
-    Enhance the prompt with additional context and examples.
-    This demonstrates advanced prompt engineering techniques.
-    """
-    
-    # Base prompt
-    prompt = f"Analyze this contract clause:\n\n{clause}"
-    
-    # Add context if provided
-    if context:
-        prompt += f"\n\nAdditional context: {context}"
-    
-    # Add industry-specific guidance
-    if industry:
-        industry_guidance = get_industry_guidance(industry)
-        prompt += f"\n\nIndustry context ({industry}): {industry_guidance}"
-    
-    # Add few-shot examples for better performance
-    prompt += """
-
-Examples of expected output format:
+# Few-shot examples for better performance
+FEW_SHOT_EXAMPLES = """Examples of expected output format:
 
 Input: "The Service Provider shall indemnify and hold harmless the Client from any and all claims."
 Output: {{
@@ -104,29 +95,128 @@ Output: {{
     "reason": "تعويض غير محدود بدون استثناءات",
     "rewrite": "يعوض مقدم الخدمة العميل عن المطالبات الناتجة عن إهمال المقدم"
   }}
-}}
+}}"""
 
-Now analyze the provided clause and respond ONLY with a JSON object following this exact format."""
-    
-    return prompt
+# Everything that is identical across requests goes first, so OpenAI's
+# automatic prompt caching can reuse the prefix. Per-request data
+# (clause, context, industry) only ever appears in the human message.
+SYSTEM_PROMPT = f"{BASE_SYSTEM_PROMPT}\n\n{FEW_SHOT_EXAMPLES}"
+
+# Industry-specific risk considerations, built once at import
+INDUSTRY_GUIDES = MappingProxyType({
+    "technology": "Consider IP ownership, data protection, SLA terms, and software licensing risks.",
+    "construction": "Focus on delay penalties, variation procedures, defects liability, and payment terms.",
+    "healthcare": "Emphasize patient data privacy, malpractice liability, and regulatory compliance.",
+    "retail": "Review inventory risk, return policies, supplier terms, and consumer protection.",
+    "finance": "Analyze regulatory compliance, fiduciary duties, and financial exposure limits.",
+    "real_estate": "Check title issues, maintenance obligations, rent escalation, and termination rights."
+})
+
+DEFAULT_GUIDE = "Apply general commercial contract principles and industry best practices."
+
+# Key for industries without a dedicated guide
+DEFAULT_INDUSTRY = "default"
+
+def normalize_context(context: Optional[str]) -> str:
+    """
+    Canonical context text, shared by the prompts and the analysis cache keys.
+    """
+    return (context or "").strip()
+
+def normalize_industry(industry: Optional[str]) -> str:
+    """
+    Canonical industry name, shared by the guide lookup and the analysis cache keys.
+    """
+    return (industry or "").strip().casefold()
 
 def get_industry_guidance(industry: str) -> str:
     """
     Provide industry-specific risk considerations.
+    Unknown industries fall back to DEFAULT_GUIDE.
     """
-    industry_guides = {
-        "technology": "Consider IP ownership, data protection, SLA terms, and software licensing risks.",
-        "construction": "Focus on delay penalties, variation procedures, defects liability, and payment terms.",
-        "healthcare": "Emphasize patient data privacy, malpractice liability, and regulatory compliance.",
-        "retail": "Review inventory risk, return policies, supplier terms, and consumer protection.",
-        "finance": "Analyze regulatory compliance, fiduciary duties, and financial exposure limits.",
-        "real_estate": "Check title issues, maintenance obligations, rent escalation, and termination rights."
-    }
+    return INDUSTRY_GUIDES.get(normalize_industry(industry), DEFAULT_GUIDE)
+
+def get_industry_key(industry: str) -> str:
+    """
+    Map a requested industry onto a known guide, or DEFAULT_INDUSTRY.
+    """
+    industry_key = normalize_industry(industry)
+    return industry_key if industry_key in INDUSTRY_GUIDES else DEFAULT_INDUSTRY
+
+def build_enhanced_template(guidance: Optional[str], has_context: bool) -> Template:
+    """
+    Render one human message variant with only the per-request fields left
+    as placeholders. The few-shot examples live in SYSTEM_PROMPT.
+    """
+    prompt = "Analyze this contract clause:\n\n$clause"
+    
+    # Add context if provided
+    if has_context:
+        prompt += "\n\nAdditional context: $context"
+    
+    # Add industry-specific guidance, escaped so it is never read as a placeholder
+    if guidance is not None:
+        prompt += f"\n\nIndustry context ($industry): {guidance.replace('$', '$$')}"
     
-    return industry_guides.get(
-        industry.lower(), 
-        "Apply general commercial contract principles and industry best practices."
+    prompt += "\n\nNow analyze the provided clause and respond ONLY with a JSON object following this exact format."
+    
+    return Template(prompt)
+
+# Every (industry, has_context) variant, specialized once at import
+ENHANCED_PROMPTS = MappingProxyType({
+    (industry_key, has_context): build_enhanced_template(guidance, has_context)
+    for industry_key, guidance in [
+        (None, None),
+        *INDUSTRY_GUIDES.items(),
+        (DEFAULT_INDUSTRY, DEFAULT_GUIDE)
+    ]
+    for has_context in (False, True)
+})
+
+def get_enhanced_prompt(clause: str, context: str = None, industry: str = None) -> str:
+    """
+    Enhance the prompt with the per-request clause, context and industry.
+    This demonstrates advanced prompt engineering techniques.
+    """
+    context = normalize_context(context)
+    industry = (industry or "").strip()
+    industry_key = get_industry_key(industry) if industry else None
+    template = ENHANCED_PROMPTS[(industry_key, bool(context))]
+    
+    return template.substitute(clause=clause, context=context, industry=industry)
+
+def get_batch_prompt(clauses: List[str], context: str = None, industry: str = None) -> str:
+    """
+    Pack several clauses into a single prompt so the shared system prompt
+    is only processed once. All clauses must share the same context and industry.
+    """
+    
+    # Numbered clauses so the model can keep outputs in order
+    numbered = "\n\n".join(
+        f"{number}. {clause}" for number, clause in enumerate(clauses, start=1)
     )
+    prompt = f"Analyze each of these {len(clauses)} contract clauses independently:\n\n{numbered}"
+    
+    context = normalize_context(context)
+    industry = (industry or "").strip()
+    
+    # Add context if provided
+    if context:
+        prompt += f"\n\nAdditional context: {context}"
+    
+    # Add industry-specific guidance
+    if industry:
+        industry_guidance = get_industry_guidance(industry)
+        prompt += f"\n\nIndustry context ({industry}): {industry_guidance}"
+    
+    prompt += (
+        f'\n\nRespond ONLY with a JSON object of the form {{"results": [...]}}, where '
+        f'"results" holds exactly {len(clauses)} objects, one per clause, each following '
+        'the exact format above plus a "clause" key holding that clause\'s number (1 to '
+        f'{len(clauses)}).'
+    )
+    
+    return prompt
 
 # Example prompt chains for complex analysis
 class PromptChains:
@@ -0,0 +1,110 @@
+"""
+Semantic Cache Module for ContractRiskAI
+Reuses prior analyses for clauses that are near-duplicates of ones already seen
+"""
+
+from collections import OrderedDict, deque
+from typing import Any, Deque, List, Optional, Tuple
+import time
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Flat inner-product index over L2-normalized clause embeddings.
+
+    Embeddings live in one preallocated matrix of ``max_entries`` rows shared
+    by every scope, so memory is fixed up front and inserts copy a single row.
+    Entries are partitioned by a scope key (context + industry) so a clause
+    is only ever matched against prior analyses produced under the same
+    conditions. Entries expire after ``ttl`` seconds; when the matrix is full
+    the oldest entry of the least recently used scope is evicted.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 2000, ttl: float = 3600):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._vectors: Optional[np.ndarray] = None
+        self._values: List[Any] = [None] * max_entries
+        self._expires = np.zeros(max_entries, dtype=np.float64)
+        self._free = list(range(max_entries - 1, -1, -1))
+        # Scope -> slots in insertion order, scopes kept in LRU order
+        self._scopes: "OrderedDict[bytes, Deque[int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return self.max_entries - len(self._free)
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _release(self, slot: int) -> None:
+        self._values[slot] = None
+        self._free.append(slot)
+
+    def _purge_expired(self, scope: bytes, now: float) -> None:
+        """
+        Drop expired slots from a scope. A fixed TTL means insertion order
+        is also expiry order, so only the front of the deque needs checking.
+        """
+        slots = self._scopes[scope]
+        while slots and self._expires[slots[0]] <= now:
+            self._release(slots.popleft())
+        if not slots:
+            del self._scopes[scope]
+
+    def lookup(self, scope: bytes, embedding: List[float]) -> Optional[Tuple[Any, float]]:
+        """
+        Return the closest cached value and its cosine similarity,
+        or None if nothing in the scope clears the threshold.
+        """
+        if scope not in self._scopes:
+            return None
+
+        self._purge_expired(scope, time.monotonic())
+        slots = self._scopes.get(scope)
+        if not slots:
+            return None
+        self._scopes.move_to_end(scope)
+
+        indices = np.fromiter(slots, dtype=np.intp, count=len(slots))
+        scores = self._vectors[indices] @ self._normalize(embedding)
+        best = int(np.argmax(scores))
+        similarity = float(scores[best])
+
+        if similarity < self.threshold:
+            return None
+        return self._values[indices[best]], similarity
+
+    def add(self, scope: bytes, embedding: List[float], value: Any) -> None:
+        """
+        Store a value under its embedding, evicting from the least recently
+        used scope when the cache is full.
+        """
+        if self.max_entries <= 0:
+            return
+
+        vector = self._normalize(embedding)
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+
+        now = time.monotonic()
+        if scope in self._scopes:
+            self._purge_expired(scope, now)
+
+        if not self._free:
+            lru_scope, lru_slots = next(iter(self._scopes.items()))
+            self._release(lru_slots.popleft())
+            if not lru_slots:
+                del self._scopes[lru_scope]
+
+        slot = self._free.pop()
+        self._vectors[slot] = vector
+        self._values[slot] = value
+        self._expires[slot] = now + self.ttl
+
+        self._scopes.setdefault(scope, deque()).append(slot)
+        self._scopes.move_to_end(scope)